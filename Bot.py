@@ -1,18 +1,28 @@
 import os
-import io
 import logging
-from typing import Optional, Dict, Any
+import platform
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import cast, c_void_p
+from typing import Dict, Any
 import asyncio
-from PIL import Image
 import cv2
 import numpy as np
 from pyzbar import pyzbar
 from pyzbar.pyzbar import ZBarSymbol
-import qrcode
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
-import requests
-from io import BytesIO
+
+# libjpeg-turbo décode directement en niveaux de gris, en sautant
+# l'intermédiaire BGR et la passe cvtColor (dépendance optionnelle)
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY
+    _TURBO_JPEG = TurboJPEG()
+except Exception:
+    _TURBO_JPEG = None
 
 # Configuration du logging
 logging.basicConfig(
@@ -21,124 +31,405 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Correspondance type de symbole pyzbar -> nom lisible, construite une seule fois
+_BARCODE_TYPE_NAMES = {
+    ZBarSymbol.EAN8: "EAN-8",
+    ZBarSymbol.EAN13: "EAN-13",
+    ZBarSymbol.UPCA: "UPC-A",
+    ZBarSymbol.UPCE: "UPC-E",
+    ZBarSymbol.CODE39: "Code 39",
+    ZBarSymbol.CODE93: "Code 93",
+    ZBarSymbol.CODE128: "Code 128",
+    ZBarSymbol.CODABAR: "Codabar",
+    ZBarSymbol.DATABAR: "DataBar",
+    ZBarSymbol.DATABAR_EXP: "DataBar Expanded",
+    ZBarSymbol.I25: "Interleaved 2 of 5",
+    ZBarSymbol.QRCODE: "QR Code",
+    ZBarSymbol.PDF417: "PDF417",
+    ZBarSymbol.DATAMATRIX: "Data Matrix",
+    ZBarSymbol.AZTEC: "Aztec Code",
+}
+# pyzbar expose le type sous forme de chaîne (nom du membre ZBarSymbol)
+_BARCODE_TYPE_NAMES.update(
+    {symbol.name: name for symbol, name in list(_BARCODE_TYPE_NAMES.items())}
+)
+
+def _load_symbols() -> list:
+    """Construit la liste des symbologies activées pour ZBar.
+
+    Chaque détecteur est une passe de scan séparée dans libzbar ; restreindre
+    la liste via la variable d'environnement SCANNER_SYMBOLS (noms ZBarSymbol
+    séparés par des virgules, ex. "QRCODE,EAN13") accélère d'autant le décodage.
+    """
+    default = [
+        ZBarSymbol.QRCODE, ZBarSymbol.EAN13, ZBarSymbol.EAN8,
+        ZBarSymbol.UPCA, ZBarSymbol.UPCE,
+        ZBarSymbol.CODE128, ZBarSymbol.CODE39, ZBarSymbol.CODE93,
+        ZBarSymbol.CODABAR, ZBarSymbol.DATABAR, ZBarSymbol.DATABAR_EXP,
+        ZBarSymbol.I25,
+        ZBarSymbol.DATAMATRIX, ZBarSymbol.PDF417, ZBarSymbol.AZTEC,
+    ]
+    env_value = os.getenv("SCANNER_SYMBOLS")
+    if not env_value:
+        return default
+    symbols = []
+    for name in env_value.split(","):
+        name = name.strip().upper()
+        if name in ZBarSymbol.__members__:
+            symbols.append(ZBarSymbol[name])
+        else:
+            logger.warning(f"SCANNER_SYMBOLS: symbologie inconnue ignorée: {name}")
+    return symbols or default
+
+# Symbologies activées pour toutes les passes de décodage
+_SYMBOLS = _load_symbols()
+
+# Préfixes reconnus dans le contenu des QR codes -> type affiché
+_QR_PREFIXES = (
+    ('http', 'URL'),
+    ('mailto:', 'Email'),
+    ('tel:', 'Téléphone'),
+    ('WIFI:', 'Configuration WiFi'),
+    ('BEGIN:VCARD', 'Carte de visite (vCard)'),
+)
+_WIFI_SSID_RE = re.compile(r'S:([^;]*)')
+
+# Cache des résultats de décodage par empreinte du contenu de l'image : les
+# utilisateurs renvoient souvent la même photo (retry réseau, re-transferts
+# de groupe). BLAKE3 (SIMD) si disponible, sinon SHA-256 de la stdlib.
+try:
+    import blake3
+
+    def _hash_image(data: bytes) -> bytes:
+        return blake3.blake3(data).digest()
+except ImportError:
+    import hashlib
+
+    def _hash_image(data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+
+_RESULT_CACHE: OrderedDict = OrderedDict()
+_RESULT_CACHE_TTL = 120.0  # secondes
+_RESULT_CACHE_MAX = 256    # entrées
+_result_cache_lock = threading.Lock()
+
+# Sérialisation du dict de résultats pour les logs structurés : orjson est
+# nettement plus rapide que json et gère les scalaires numpy nativement
+try:
+    import orjson
+
+    def _dump_results(results: Dict[str, Any]) -> str:
+        return orjson.dumps(
+            results, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+except ImportError:
+    import json
+
+    def _dump_results(results: Dict[str, Any]) -> str:
+        return json.dumps(results, default=str)
+
+# Dimension maximale (px) d'une image avant scan : le coût de ZBar est
+# linéaire en nombre de pixels et les codes restent lisibles bien en dessous
+_MAX_SCAN_DIM = 1600
+
+# Délai maximal (s) pour chaque aller-retour vers les serveurs de fichiers
+# Telegram, afin qu'un CDN lent ne monopolise pas un handler indéfiniment
+_DOWNLOAD_TIMEOUT = 30.0
+
+# pyzbar.decode recrée et reconfigure un zbar_image_scanner_t à chaque appel,
+# soit une fois par passe de préprocessing. On réutilise ici un scanner par
+# thread via les mêmes primitives internes, avec repli sur pyzbar.decode si
+# elles changent dans une future version de pyzbar.
+try:
+    from pyzbar.pyzbar import (
+        _FOURCC, _decode_symbols, _image, _pixel_data, _symbols_for_image,
+    )
+    from pyzbar.pyzbar_error import PyZbarError
+    from pyzbar.wrapper import (
+        ZBarConfig, zbar_image_scanner_create, zbar_image_scanner_set_config,
+        zbar_image_set_data, zbar_image_set_format, zbar_image_set_size,
+        zbar_scan_image,
+    )
+    _SCANNER_REUSE = True
+except ImportError:
+    _SCANNER_REUSE = False
+
+_scanner_local = threading.local()
+
+# Binarisation adaptative fusionnée en un seul passage via Numba : la somme
+# locale est obtenue par image intégrale (4 lectures par pixel) au lieu des
+# deux passes mémoire de cv2.adaptiveThreshold (dépendance optionnelle)
+try:
+    from numba import njit, prange
+    _NUMBA = True
+except ImportError:
+    _NUMBA = False
+
+if _NUMBA:
+    @njit(parallel=True, cache=True)
+    def _adaptive_binarize(gray, radius, c):
+        h, w = gray.shape
+        integral = np.zeros((h + 1, w + 1), dtype=np.int64)
+        for y in range(h):
+            row_sum = 0
+            for x in range(w):
+                row_sum += gray[y, x]
+                integral[y + 1, x + 1] = integral[y, x + 1] + row_sum
+        out = np.empty((h, w), dtype=np.uint8)
+        for y in prange(h):
+            y0 = max(0, y - radius)
+            y1 = min(h, y + radius + 1)
+            for x in range(w):
+                x0 = max(0, x - radius)
+                x1 = min(w, x + radius + 1)
+                area = (y1 - y0) * (x1 - x0)
+                local_sum = (
+                    integral[y1, x1] - integral[y0, x1]
+                    - integral[y1, x0] + integral[y0, x0]
+                )
+                # équivaut à : gray > moyenne locale - c
+                out[y, x] = 255 if (gray[y, x] + c) * area > local_sum else 0
+        return out
+
+
+def _adaptive_threshold(gray: np.ndarray, dst: np.ndarray = None) -> np.ndarray:
+    """Seuillage adaptatif (fenêtre 11x11, C=2), fusionné via Numba si dispo"""
+    if _NUMBA:
+        return _adaptive_binarize(gray, 5, 2)
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2,
+        dst=dst
+    )
+
+
+_buffer_local = threading.local()
+
+
+def _scratch_buffer(shape) -> np.ndarray:
+    """Tampon uint8 contigu réutilisable par thread pour les variantes.
+
+    Les variantes préprocessées sont consommées séquentiellement : une fois
+    qu'une passe a échoué, son tampon peut être réécrit par la suivante, donc
+    un seul tampon par forme d'image suffit par thread.
+    """
+    buf = getattr(_buffer_local, 'buf', None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        _buffer_local.buf = buf
+    return buf
+
+
+def _scan_image(image, symbols) -> list:
+    """Décode `image` en réutilisant un scanner ZBar par thread.
+
+    Équivalent à `pyzbar.decode(image, symbols=symbols)` sans l'allocation
+    ni la configuration des symbologies à chaque appel : le scanner n'est
+    reconfiguré que si la liste de symbologies demandée change.
+    """
+    if not _SCANNER_REUSE:
+        return pyzbar.decode(image, symbols=symbols)
+
+    scanner = getattr(_scanner_local, 'scanner', None)
+    if scanner is None:
+        scanner = zbar_image_scanner_create()
+        if not scanner:
+            return pyzbar.decode(image, symbols=symbols)
+        _scanner_local.scanner = scanner
+        _scanner_local.symbols = None
+
+    wanted = frozenset(symbols)
+    if wanted != _scanner_local.symbols:
+        for symbol in ZBarSymbol:
+            zbar_image_scanner_set_config(
+                scanner, symbol, ZBarConfig.CFG_ENABLE,
+                1 if symbol in wanted else 0
+            )
+        _scanner_local.symbols = wanted
+
+    pixels, width, height = _pixel_data(image)
+    results = []
+    with _image() as img:
+        zbar_image_set_format(img, _FOURCC['L800'])
+        zbar_image_set_size(img, width, height)
+        zbar_image_set_data(img, cast(pixels, c_void_p), len(pixels), None)
+        decoded = zbar_scan_image(scanner, img)
+        if decoded < 0:
+            raise PyZbarError('Unsupported image format')
+        results.extend(_decode_symbols(_symbols_for_image(img)))
+    return results
+
 class CodeDecoder:
     """Classe pour décoder différents types de codes"""
-    
+
     @staticmethod
     def get_barcode_type_name(symbol_type) -> str:
         """Convertit le type de symbole pyzbar en nom lisible"""
-        type_mapping = {
-            ZBarSymbol.EAN8: "EAN-8",
-            ZBarSymbol.EAN13: "EAN-13", 
-            ZBarSymbol.UPCA: "UPC-A",
-            ZBarSymbol.UPCE: "UPC-E",
-            ZBarSymbol.CODE39: "Code 39",
-            ZBarSymbol.CODE93: "Code 93",
-            ZBarSymbol.CODE128: "Code 128",
-            ZBarSymbol.CODABAR: "Codabar",
-            ZBarSymbol.DATABAR: "DataBar",
-            ZBarSymbol.DATABAR_EXP: "DataBar Expanded",
-            ZBarSymbol.I25: "Interleaved 2 of 5",
-            ZBarSymbol.QRCODE: "QR Code",
-            ZBarSymbol.PDF417: "PDF417",
-            ZBarSymbol.DATAMATRIX: "Data Matrix",
-            ZBarSymbol.AZTEC: "Aztec Code"
-        }
-        return type_mapping.get(symbol_type, f"Type inconnu ({symbol_type})")
+        return _BARCODE_TYPE_NAMES.get(symbol_type, f"Type inconnu ({symbol_type})")
     
     @staticmethod
-    def preprocess_image(image: np.ndarray) -> list:
-        """Préprocesse l'image pour améliorer la détection"""
-        processed_images = []
-        
-        # Image originale
-        processed_images.append(image)
-        
-        # Conversion en niveaux de gris
+    def preprocess_image(image: np.ndarray):
+        """Génère à la demande les variantes préprocessées de l'image.
+
+        Générateur : chaque variante n'est calculée que si les précédentes
+        n'ont rien donné, ce qui évite des passes de préprocessing inutiles
+        pour une photo nette. ZBar convertissant lui-même en gris et
+        binarisant en interne, les passes couleur et Otsu sont redondantes.
+        """
+        # Conversion en niveaux de gris, en uint8 C-contigu : ZBar recevant
+        # les pixels via tobytes(), une entrée déjà contiguë évite une copie
+        # de coercition par passe
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
             gray = image
-        processed_images.append(gray)
-        
-        # Amélioration du contraste
-        enhanced = cv2.equalizeHist(gray)
-        processed_images.append(enhanced)
-        
-        # Seuillage adaptatif
-        thresh = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        gray = np.ascontiguousarray(gray, dtype=np.uint8)
+        yield gray
+
+        # L'histogramme (un bincount SIMD) sert de test de contraste : si la
+        # plage dynamique est déjà large sans pic dominant, toute égalisation
+        # est inutile et on économise la passe entière
+        hist = np.bincount(gray.ravel(), minlength=256)
+        nonzero = np.flatnonzero(hist)
+        low_contrast = (
+            nonzero[-1] - nonzero[0] < 220 or hist.max() > gray.size // 8
         )
-        processed_images.append(thresh)
-        
-        # Seuillage d'Otsu
-        _, otsu = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        processed_images.append(otsu)
-        
-        return processed_images
+
+        # Tampon de sortie partagé par les variantes successives
+        buf = _scratch_buffer(gray.shape)
+
+        if low_contrast:
+            # Égalisation globale via LUT construite depuis l'histogramme
+            # déjà calculé : une table de 256 entrées + un seul balayage,
+            # au lieu des deux passes internes de cv2.equalizeHist
+            cdf = hist.cumsum()
+            cdf_min = cdf[nonzero[0]]
+            denom = gray.size - cdf_min
+            if denom > 0:
+                lut = ((cdf - cdf_min) * 255.0 / denom).clip(0, 255).astype(np.uint8)
+                yield cv2.LUT(gray, lut, dst=buf)
+
+            # CLAHE en dernier recours pour l'éclairage non uniforme
+            clahe = cv2.createCLAHE(clipLimit=2.0)
+            yield clahe.apply(gray, buf)
+
+        # Seuillage adaptatif
+        yield _adaptive_threshold(gray, dst=buf)
     
     @staticmethod
     def decode_codes(image_data: bytes) -> Dict[str, Any]:
         """Décode tous les types de codes dans une image"""
-        # Conversion en array numpy
-        image_array = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-        
+        # Court-circuit si la même image a été décodée récemment
+        cache_key = _hash_image(image_data)
+        now = time.monotonic()
+        with _result_cache_lock:
+            cached = _RESULT_CACHE.get(cache_key)
+            if cached is not None and now - cached[0] < _RESULT_CACHE_TTL:
+                _RESULT_CACHE.move_to_end(cache_key)
+                return cached[1]
+
+        # Décodage JPEG directement en niveaux de gris via libjpeg-turbo
+        # quand c'est possible (les photos Telegram sont des JPEG)
+        image = None
+        if _TURBO_JPEG is not None:
+            try:
+                image = _TURBO_JPEG.decode(image_data, pixel_format=TJPF_GRAY)
+                if image.ndim == 3:
+                    image = image[:, :, 0]
+            except Exception:
+                image = None  # pas un JPEG : retour au chemin OpenCV
+
+        if image is None:
+            image_array = np.frombuffer(image_data, np.uint8)
+            image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+
         if image is None:
             return {"error": "Impossible de lire l'image"}
-        
+
+        # Réduction des photos très haute résolution avant scan : on rapporte
+        # les dimensions d'origine mais on scanne la copie réduite
+        orig_h, orig_w = image.shape[:2]
+        scale = 1.0
+        if max(orig_h, orig_w) > _MAX_SCAN_DIM:
+            scale = _MAX_SCAN_DIM / max(orig_h, orig_w)
+            image = cv2.resize(
+                image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+        inv_scale = 1.0 / scale
+
         results = {
             "codes_found": [],
             "image_info": {
-                "dimensions": f"{image.shape[1]}x{image.shape[0]}",
+                "dimensions": f"{orig_w}x{orig_h}",
                 "channels": image.shape[2] if len(image.shape) == 3 else 1
             }
         }
         
-        # Essai sur différentes versions préprocessées de l'image
-        processed_images = CodeDecoder.preprocess_image(image)
-        
+        # Essai sur différentes versions préprocessées de l'image. Chaque
+        # passe réussie retire les symbologies déjà trouvées de la liste des
+        # détecteurs activés, donc les passes suivantes font strictement
+        # moins de travail ; on s'arrête dès que les résultats se stabilisent
         all_decoded = []
-        for i, proc_img in enumerate(processed_images):
+        seen = set()
+        remaining_symbols = set(_SYMBOLS)
+        for i, proc_img in enumerate(CodeDecoder.preprocess_image(image)):
+            found_new = False
             try:
-                decoded_objects = pyzbar.decode(proc_img)
+                decoded_objects = _scan_image(proc_img, remaining_symbols)
                 for obj in decoded_objects:
-                    # Éviter les doublons
-                    if not any(existing['data'] == obj.data.decode('utf-8', errors='ignore') 
-                             and existing['type'] == CodeDecoder.get_barcode_type_name(obj.type) 
-                             for existing in all_decoded):
-                        all_decoded.append({
-                            'data': obj.data.decode('utf-8', errors='ignore'),
-                            'type': CodeDecoder.get_barcode_type_name(obj.type),
-                            'raw_type': str(obj.type),
-                            'quality': obj.quality if hasattr(obj, 'quality') else 'N/A',
-                            'rect': {
-                                'x': obj.rect.left,
-                                'y': obj.rect.top,
-                                'width': obj.rect.width,
-                                'height': obj.rect.height
-                            },
-                            'polygon': [(point.x, point.y) for point in obj.polygon],
-                            'preprocessing_step': i
-                        })
+                    # Éviter les doublons : clé sur les octets bruts pour ne
+                    # décoder l'UTF-8 qu'une seule fois par code unique
+                    key = (obj.data, obj.type)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    found_new = True
+                    symbol = ZBarSymbol.__members__.get(obj.type)
+                    if symbol is not None:
+                        remaining_symbols.discard(symbol)
+                    all_decoded.append({
+                        'data': obj.data.decode('utf-8', errors='ignore'),
+                        'type': CodeDecoder.get_barcode_type_name(obj.type),
+                        'raw_type': str(obj.type),
+                        'quality': obj.quality if hasattr(obj, 'quality') else 'N/A',
+                        # Coordonnées ramenées au repère de l'image d'origine
+                        'rect': {
+                            'x': round(obj.rect.left * inv_scale),
+                            'y': round(obj.rect.top * inv_scale),
+                            'width': round(obj.rect.width * inv_scale),
+                            'height': round(obj.rect.height * inv_scale)
+                        },
+                        'polygon': [
+                            (round(point.x * inv_scale), round(point.y * inv_scale))
+                            for point in obj.polygon
+                        ],
+                        'preprocessing_step': i
+                    })
             except Exception as e:
                 logger.warning(f"Erreur lors du décodage étape {i}: {e}")
+            if not remaining_symbols:
+                break
+            if all_decoded and not found_new:
+                # Les résultats sont stables : les passes suivantes ne
+                # feraient que re-scanner avec les mêmes détecteurs
+                break
         
         results["codes_found"] = all_decoded
         results["total_codes"] = len(all_decoded)
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Résultats du décodage: %s", _dump_results(results))
+
+        with _result_cache_lock:
+            _RESULT_CACHE[cache_key] = (time.monotonic(), results)
+            _RESULT_CACHE.move_to_end(cache_key)
+            while len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+                _RESULT_CACHE.popitem(last=False)
+
         return results
 
-class TelegramBot:
-    """Bot Telegram principal"""
-    
-    def __init__(self, token: str):
-        self.token = token
-        self.decoder = CodeDecoder()
-        
-    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Commande /start"""
-        welcome_text = """
+# Réponses statiques construites une seule fois au chargement du module :
+# textes et clavier inline immuables, réutilisés tels quels par les handlers
+_WELCOME_TEXT = """
 🔍 **Bot Décodeur de Codes Ultra-Précis**
 
 Je peux décoder avec une précision maximale :
@@ -161,16 +452,72 @@ Je peux décoder avec une précision maximale :
 
 Envoyez une image pour commencer !
         """
+
+_WELCOME_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📖 Guide des codes", callback_data='guide')],
+    [InlineKeyboardButton("ℹ️ À propos", callback_data='about')]
+])
+
+_GUIDE_TEXT = """
+📖 **Guide des Types de Codes**
+
+**🏷️ Codes-barres 1D :**
+• **EAN-13/8** : Produits commerciaux
+• **UPC-A/E** : Produits américains
+• **Code 39** : Industrie, inventaire
+• **Code 128** : Logistique, transport
+• **Codabar** : Bibliothèques, banques de sang
+
+**📱 Codes 2D :**
+• **QR Code** : URLs, texte, WiFi, vCards
+• **Data Matrix** : Marquage industriel
+• **Aztec Code** : Billets, transport
+• **PDF417** : Documents d'identité
+
+**🎯 Conseils de qualité :**
+• Éclairage uniforme sans reflets
+• Image nette et bien cadrée
+• Contraste suffisant
+• Éviter les déformations
+            """
+
+_ABOUT_TEXT = """
+ℹ️ **À propos de ce bot**
+
+**🔧 Technologies utilisées :**
+• pyzbar : Décodage multi-format
+• OpenCV : Traitement d'image avancé
+• PIL : Manipulation d'images
+• Telegram Bot API
+
+**⚡ Fonctionnalités :**
+• Détection ultra-précise
+• Préprocessing intelligent
+• Support multi-codes
+• Analyse détaillée du contenu
+
+**👨‍💻 Développé avec :**
+Python 3.9+ et amour du code propre !
+
+Version 1.0 - 2025
+            """
+
+class TelegramBot:
+    """Bot Telegram principal"""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.decoder = CodeDecoder()
+        # Le décodage est borné CPU et garde le GIL : on l'exécute dans un
+        # pool de processus pour ne pas bloquer la boucle asyncio et pour
+        # traiter les photos de plusieurs utilisateurs en parallèle
+        self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
         
-        keyboard = [
-            [InlineKeyboardButton("📖 Guide des codes", callback_data='guide')],
-            [InlineKeyboardButton("ℹ️ À propos", callback_data='about')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Commande /start"""
         await update.message.reply_text(
-            welcome_text, 
-            reply_markup=reply_markup,
+            _WELCOME_TEXT,
+            reply_markup=_WELCOME_MARKUP,
             parse_mode='Markdown'
         )
     
@@ -180,15 +527,25 @@ Envoyez une image pour commencer !
             # Message de traitement
             processing_msg = await update.message.reply_text("🔍 Analyse en cours...")
             
-            # Récupération de la photo en haute qualité
+            # Récupération de la photo en haute qualité, chaque aller-retour
+            # vers le serveur de fichiers étant borné dans le temps
             photo = update.message.photo[-1]  # Plus haute résolution
-            file = await context.bot.get_file(photo.file_id)
-            
-            # Téléchargement de l'image
-            image_data = await file.download_as_bytearray()
-            
-            # Décodage
-            results = self.decoder.decode_codes(image_data)
+            file = await asyncio.wait_for(
+                context.bot.get_file(photo.file_id), timeout=_DOWNLOAD_TIMEOUT
+            )
+
+            # Téléchargement de l'image : conversion en bytes immuables une
+            # seule fois (évite la copie implicite de cv2/np.frombuffer sur
+            # un tampon modifiable, et le pickling d'un bytearray)
+            image_data = bytes(await asyncio.wait_for(
+                file.download_as_bytearray(), timeout=_DOWNLOAD_TIMEOUT
+            ))
+
+            # Décodage hors de la boucle d'événements (decode_codes est une
+            # staticmethod de module, donc picklable pour le pool)
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._pool, CodeDecoder.decode_codes, image_data
+            )
             
             if "error" in results:
                 await processing_msg.edit_text(f"❌ Erreur: {results['error']}")
@@ -220,70 +577,67 @@ Envoyez une image pour commencer !
 • Vérifiez que le contraste est suffisant
             """
         
-        response = f"✅ **{results['total_codes']} code(s) détecté(s)**\n\n"
-        response += f"📐 **Info image :** {results['image_info']['dimensions']}\n\n"
-        
+        # Assemblage dans une liste jointe une seule fois : la concaténation
+        # += réallouait la réponse entière à chaque fragment
+        parts = [
+            f"✅ **{results['total_codes']} code(s) détecté(s)**\n\n",
+            f"📐 **Info image :** {results['image_info']['dimensions']}\n\n",
+        ]
+
         for i, code in enumerate(results["codes_found"], 1):
-            response += f"**📊 Code #{i} - {code['type']}**\n"
-            response += f"```\n{code['data']}\n```\n"
-            
+            parts.append(f"**📊 Code #{i} - {code['type']}**\n")
+            parts.append(f"```\n{code['data']}\n```\n")
+
             # Informations détaillées
-            response += f"• **Position :** ({code['rect']['x']}, {code['rect']['y']})\n"
-            response += f"• **Taille :** {code['rect']['width']}×{code['rect']['height']}px\n"
-            
+            parts.append(f"• **Position :** ({code['rect']['x']}, {code['rect']['y']})\n")
+            parts.append(f"• **Taille :** {code['rect']['width']}×{code['rect']['height']}px\n")
+
             if code['quality'] != 'N/A':
-                response += f"• **Qualité :** {code['quality']}\n"
-            
+                parts.append(f"• **Qualité :** {code['quality']}\n")
+
             # Analyse du contenu pour certains types
             if code['type'] in ['EAN-13', 'EAN-8', 'UPC-A', 'UPC-E']:
-                response += self.analyze_product_code(code['data'])
+                parts.extend(self.analyze_product_code(code['data']))
             elif code['type'] == 'QR Code':
-                response += self.analyze_qr_content(code['data'])
-            
-            response += "\n"
-        
-        return response
-    
-    def analyze_product_code(self, data: str) -> str:
-        """Analyse les codes produits"""
-        analysis = ""
+                parts.extend(self.analyze_qr_content(code['data']))
+
+            parts.append("\n")
+
+        return "".join(parts)
+
+    def analyze_product_code(self, data: str) -> list:
+        """Analyse les codes produits (fragments à joindre par l'appelant)"""
         if len(data) == 13:  # EAN-13
-            country_code = data[:3]
-            analysis += f"• **Code pays :** {country_code}\n"
-            analysis += f"• **Code fabricant :** {data[3:8]}\n"
-            analysis += f"• **Code produit :** {data[8:12]}\n"
-            analysis += f"• **Chiffre de contrôle :** {data[12]}\n"
-        elif len(data) == 8:  # EAN-8
-            analysis += f"• **Code pays :** {data[:2]}\n"
-            analysis += f"• **Code produit :** {data[2:7]}\n"
-            analysis += f"• **Chiffre de contrôle :** {data[7]}\n"
-        
-        return analysis
-    
-    def analyze_qr_content(self, data: str) -> str:
-        """Analyse le contenu des QR codes"""
-        analysis = ""
-        
-        if data.startswith('http'):
-            analysis += f"• **Type :** URL\n"
-        elif data.startswith('mailto:'):
-            analysis += f"• **Type :** Email\n"
-        elif data.startswith('tel:'):
-            analysis += f"• **Type :** Téléphone\n"
-        elif data.startswith('WIFI:'):
-            analysis += f"• **Type :** Configuration WiFi\n"
-            # Parse WiFi data
-            if 'S:' in data:
-                ssid = data.split('S:')[1].split(';')[0]
-                analysis += f"• **SSID :** {ssid}\n"
-        elif data.startswith('BEGIN:VCARD'):
-            analysis += f"• **Type :** Carte de visite (vCard)\n"
-        else:
-            analysis += f"• **Type :** Texte\n"
-        
-        analysis += f"• **Longueur :** {len(data)} caractères\n"
-        
-        return analysis
+            return [
+                f"• **Code pays :** {data[:3]}\n",
+                f"• **Code fabricant :** {data[3:8]}\n",
+                f"• **Code produit :** {data[8:12]}\n",
+                f"• **Chiffre de contrôle :** {data[12]}\n",
+            ]
+        if len(data) == 8:  # EAN-8
+            return [
+                f"• **Code pays :** {data[:2]}\n",
+                f"• **Code produit :** {data[2:7]}\n",
+                f"• **Chiffre de contrôle :** {data[7]}\n",
+            ]
+        return []
+
+    def analyze_qr_content(self, data: str) -> list:
+        """Analyse le contenu des QR codes (fragments à joindre par l'appelant)"""
+        qr_type = next(
+            (label for prefix, label in _QR_PREFIXES if data.startswith(prefix)),
+            'Texte'
+        )
+        parts = [f"• **Type :** {qr_type}\n"]
+
+        if qr_type == 'Configuration WiFi':
+            match = _WIFI_SSID_RE.search(data)
+            if match:
+                parts.append(f"• **SSID :** {match.group(1)}\n")
+
+        parts.append(f"• **Longueur :** {len(data)} caractères\n")
+
+        return parts
     
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Gère les callbacks des boutons inline"""
@@ -291,57 +645,47 @@ Envoyez une image pour commencer !
         await query.answer()
         
         if query.data == 'guide':
-            guide_text = """
-📖 **Guide des Types de Codes**
-
-**🏷️ Codes-barres 1D :**
-• **EAN-13/8** : Produits commerciaux
-• **UPC-A/E** : Produits américains  
-• **Code 39** : Industrie, inventaire
-• **Code 128** : Logistique, transport
-• **Codabar** : Bibliothèques, banques de sang
-
-**📱 Codes 2D :**
-• **QR Code** : URLs, texte, WiFi, vCards
-• **Data Matrix** : Marquage industriel
-• **Aztec Code** : Billets, transport
-• **PDF417** : Documents d'identité
+            await query.edit_message_text(_GUIDE_TEXT, parse_mode='Markdown')
 
-**🎯 Conseils de qualité :**
-• Éclairage uniforme sans reflets
-• Image nette et bien cadrée
-• Contraste suffisant
-• Éviter les déformations
-            """
-            await query.edit_message_text(guide_text, parse_mode='Markdown')
-            
         elif query.data == 'about':
-            about_text = """
-ℹ️ **À propos de ce bot**
-
-**🔧 Technologies utilisées :**
-• pyzbar : Décodage multi-format
-• OpenCV : Traitement d'image avancé
-• PIL : Manipulation d'images
-• Telegram Bot API
-
-**⚡ Fonctionnalités :**
-• Détection ultra-précise
-• Préprocessing intelligent
-• Support multi-codes
-• Analyse détaillée du contenu
-
-**👨‍💻 Développé avec :**
-Python 3.9+ et amour du code propre !
-
-Version 1.0 - 2025
-            """
-            await query.edit_message_text(about_text, parse_mode='Markdown')
+            await query.edit_message_text(_ABOUT_TEXT, parse_mode='Markdown')
     
     def run(self):
         """Lance le bot"""
-        # Création de l'application
-        application = Application.builder().token(self.token).build()
+        # Les optimisations SIMD et le multithreading d'OpenCV sont réglables
+        # à l'exécution : on les active explicitement et on journalise l'état
+        # détecté pour repérer un build silencieusement retombé en scalaire
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(max(1, (os.cpu_count() or 2) - 1))
+        try:
+            ipp = cv2.ipp.useIPP()
+        except AttributeError:
+            ipp = False
+        build_info = cv2.getBuildInformation()
+        simd_levels = [
+            level for level in ('AVX512', 'AVX2', 'SSE4.2', 'NEON')
+            if level in build_info
+        ]
+        logger.info(
+            f"OpenCV: optimisé={cv2.useOptimized()}, "
+            f"threads={cv2.getNumThreads()}, IPP={ipp}, "
+            f"SIMD={'/'.join(simd_levels) or 'aucun'}"
+        )
+        if platform.machine() in ('x86_64', 'AMD64') and 'AVX2' not in build_info:
+            logger.warning(
+                "Build OpenCV sans AVX2 sur x86_64 : seuillage et conversion "
+                "de couleurs nettement plus lents qu'attendu"
+            )
+
+        # Création de l'application : pools de connexions élargis pour que
+        # plusieurs handlers de photos puissent télécharger en parallèle
+        application = (
+            Application.builder()
+            .token(self.token)
+            .connection_pool_size(16)
+            .get_updates_connection_pool_size(16)
+            .build()
+        )
         
         # Ajout des handlers
         application.add_handler(CommandHandler("start", self.start))
@@ -349,6 +693,10 @@ Version 1.0 - 2025
         application.add_handler(CallbackQueryHandler(self.handle_callback))
         
         # Démarrage
+        if _NUMBA:
+            # Compile le noyau de binarisation maintenant plutôt qu'à la
+            # première photo reçue
+            _adaptive_threshold(np.zeros((32, 32), dtype=np.uint8))
         logger.info("Bot démarré !")
         application.run_polling(allowed_updates=Update.ALL_TYPES)
 